@@ -17,193 +17,427 @@
 #--------------------------------------------------------------------------------
 
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields, is_dataclass
 import json
+import mmap
 import os
 from pathlib import Path
+import re
 import sys
 from typing import *
 
 from klayout_plugin_utils.debugging import debug, Debugging
 from klayout_plugin_utils.str_enum_compat import StrEnum
-from klayout_plugin_utils.dataclass_dict_helpers import dataclass_from_dict
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, fall back to the stdlib
+    _json_loads = lambda raw: json.loads(bytes(raw))  # json.loads does not accept memoryview
+
+# NOTE: writing is a developer tool only, always use the stdlib to keep
+#       the 4-space indentation of the shipped PDK info files
+_json_dumps = lambda obj: json.dumps(obj, indent=4).encode('utf-8')
+
+try:
+    import simdjson
+except ImportError:  # simdjson is optional
+    simdjson = None
+
+try:
+    from mashumaro import DataClassDictMixin
+    _HAS_MASHUMARO = True
+except ImportError:  # mashumaro is optional, fall back to _dataclass_factory
+    DataClassDictMixin = object
+    _HAS_MASHUMARO = False
+
+
+# NOTE: simdjson only pays off for large documents,
+#       below that its parser setup loses against orjson/stdlib
+_LARGE_JSON_SIZE = 1_000_000
+
+
+def _load_json(raw: Union[bytes, memoryview]) -> Any:
+    if simdjson is not None and len(raw) >= _LARGE_JSON_SIZE:
+        return simdjson.Parser().parse(raw, True)
+    return _json_loads(raw)
+
+
+_DATACLASS_FACTORIES: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def _dataclass_factory(cls: type) -> Callable[[Dict[str, Any]], Any]:
+    # NOTE: resolve the type hints only once per class and generate a specialized
+    #       straight-line constructor, e.g. for NamedLayerGroup:
+    #
+    #       def _factory(d):
+    #           return cls(name=d['name'], layers=d['layers'])
+    factory = _DATACLASS_FACTORIES.get(cls, None)
+    if factory is not None:
+        return factory
+    
+    hints = get_type_hints(cls)
+    ns: Dict[str, Any] = {'cls': cls}
+    args = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        t = hints[f.name]
+        if get_origin(t) is list and is_dataclass(get_args(t)[0]):
+            ns[f"_{f.name}_factory"] = _dataclass_factory(get_args(t)[0])
+            args.append(f"{f.name}=[_{f.name}_factory(x) for x in d[{f.name!r}]]")
+        elif is_dataclass(t):
+            ns[f"_{f.name}_factory"] = _dataclass_factory(t)
+            args.append(f"{f.name}=_{f.name}_factory(d[{f.name!r}])")
+        else:
+            args.append(f"{f.name}=d[{f.name!r}]")
+    
+    src = f"def _factory(d):\n    return cls({', '.join(args)})\n"
+    exec(src, ns)
+    factory = ns['_factory']
+    _DATACLASS_FACTORIES[cls] = factory
+    return factory
+
+#--------------------------------------------------------------------------------
 
 LayerUniqueName = str
 LayerGroupUniqueName = str
 
 
-@dataclass
-class NamedLayerGroup:
+def _cache_field():
+    # NOTE: internal caches, not part of __init__, repr, comparison or the JSON file
+    return field(init=False, repr=False, compare=False, metadata={'serialize': 'omit'})
+
+
+@dataclass(slots=True)
+class NamedLayerGroup(DataClassDictMixin):
     name: LayerGroupUniqueName
     layers: List[LayerUniqueName]
+    
+    _layers_set: FrozenSet[LayerUniqueName] = _cache_field()
+    
+    def __post_init__(self):
+        # NOTE: layer names repeat across groups and PDKs, interning them
+        #       makes the hashing/comparison in the lookups pointer-cheap
+        self.name = sys.intern(self.name)
+        self.layers = [sys.intern(l) for l in self.layers]
+        self._layers_set = frozenset(self.layers)
 
 
-@dataclass
-class PinLayerInfo:
-    short_layer_name: str                   # e.g. Metal1, GatPoly, ...
-    related_layers: LayerGroupUniqueName    # e.g. Metal1.drawing, Metal1.pin, Metal1.text, Metal1.dumm, Metal1.label, ...
-                                            # helps us to find the appropriate layers,
-                                            # if any of those related layer is selected
-    pin_layers: LayerGroupUniqueName        # Metal1.pin  (if multiple, the pin will be created on all of those)
-    label_layers: LayerGroupUniqueName       # Metal1.text   (if multiple, the label will be created on all of those)
+@dataclass(slots=True)
+class PinLayerInfo(DataClassDictMixin):
+    short_layer_name: str                         # e.g. Metal1, GatPoly, ...
+    related_layers: List[LayerGroupUniqueName]    # e.g. Metal1.drawing, Metal1.pin, Metal1.text, Metal1.dumm, Metal1.label, ...
+                                                  # helps us to find the appropriate layers,
+                                                  # if any of those related layer is selected
+    pin_layers: List[LayerGroupUniqueName]        # Metal1.pin  (if multiple, the pin will be created on all of those)
+    label_layers: List[LayerGroupUniqueName]      # Metal1.text   (if multiple, the label will be created on all of those)
+    
+    # filled in by the owning PinPDKInfo, use PinPDKInfo.pin_layer_names()/label_layer_names()
+    _resolved_pin_layer_names: Optional[Tuple[LayerUniqueName, ...]] = _cache_field()
+    _resolved_label_layer_names: Optional[Tuple[LayerUniqueName, ...]] = _cache_field()
+
+    def __post_init__(self):
+        self.short_layer_name = sys.intern(self.short_layer_name)
+        self.related_layers = [sys.intern(n) for n in self.related_layers]
+        self.pin_layers = [sys.intern(n) for n in self.pin_layers]
+        self.label_layers = [sys.intern(n) for n in self.label_layers]
+        self._resolved_pin_layer_names = None
+        self._resolved_label_layer_names = None
 
 
 #--------------------------------------------------------------------------------
 
-@dataclass
-class PinPDKInfo:
+@dataclass(slots=True)
+class PinPDKInfo(DataClassDictMixin):
     tech_name: str
     layer_group_definitions: List[NamedLayerGroup]
     pin_layer_infos: List[PinLayerInfo]
     
+    _layer_sets_by_group_name: Dict[LayerGroupUniqueName, FrozenSet[LayerUniqueName]] = _cache_field()
+    _layer_groups_cache: Dict[FrozenSet[LayerGroupUniqueName], Tuple[NamedLayerGroup, ...]] = _cache_field()
+    _layers_of_groups_cache: Dict[FrozenSet[LayerGroupUniqueName], Tuple[LayerUniqueName, ...]] = _cache_field()
+    _pin_layer_infos_by_layer: Optional[Dict[LayerUniqueName, PinLayerInfo]] = _cache_field()
+    
+    def __post_init__(self):
+        self._layer_sets_by_group_name = {}
+        for g in self.layer_group_definitions:
+            layers = self._layer_sets_by_group_name.get(g.name, None)
+            self._layer_sets_by_group_name[g.name] = g._layers_set if layers is None else layers | g._layers_set
+        self._layer_groups_cache = {}
+        self._layers_of_groups_cache = {}
+        
+        # built lazily on the first pin_layer_info() lookup
+        self._pin_layer_infos_by_layer = None
+        
+        # NOTE: attach the pin/label layers to each PinLayerInfo,
+        #       so pin placement does not need to resolve the groups again
+        for pli in self.pin_layer_infos:
+            pli._resolved_pin_layer_names = self.layers_of_groups(pli.pin_layers)
+            pli._resolved_label_layer_names = self.layers_of_groups(pli.label_layers)
+    
     @classmethod
     def read_json(cls, path: Path) -> PinPDKInfo:
-        with open(path) as f:
-            data = json.load(f)
-            return dataclass_from_dict(cls, data)
+        with open(path, 'rb') as f:
+            # NOTE: for small files, a plain read is cheaper than setting up a mapping
+            if os.fstat(f.fileno()).st_size < _LARGE_JSON_SIZE:
+                return cls.from_json(f.read())
+            # NOTE: parse straight out of the page cache, no userland copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as raw:
+                    return cls.from_json(raw)
+    
+    @classmethod
+    def from_json(cls, raw: Union[bytes, memoryview]) -> PinPDKInfo:
+        data = _load_json(raw)
+        if _HAS_MASHUMARO:
+            return cls.from_dict(data)
+        return _dataclass_factory(cls)(data)
         
     def write_json(self, path: Path):
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(asdict(self), f, indent=4)
+        with open(path, 'wb') as f:
+            f.write(_json_dumps(self._to_plain()))
+    
+    def _to_plain(self) -> Dict[str, Any]:
+        # NOTE: the schema is fixed and shallow, so build the dict by hand
+        #       instead of the generic (deep-copying) asdict() walk
+        return {
+            'tech_name': self.tech_name,
+            'layer_group_definitions': [
+                {'name': g.name, 'layers': list(g.layers)}
+                for g in self.layer_group_definitions
+            ],
+            'pin_layer_infos': [
+                {'short_layer_name': p.short_layer_name,
+                 'related_layers': list(p.related_layers),
+                 'pin_layers': list(p.pin_layers),
+                 'label_layers': list(p.label_layers)}
+                for p in self.pin_layer_infos
+            ]
+        }
             
-    def layer_groups(self, names: List[LayerGroupUniqueName]) -> List[NamedLayerGroup]:
-        return [g for g in self.layer_group_definitions if g.name in names]
+    def layer_groups(self, names: List[LayerGroupUniqueName]) -> Tuple[NamedLayerGroup, ...]:
+        key = frozenset(names)
+        groups = self._layer_groups_cache.get(key, None)
+        if groups is None:
+            groups = tuple(g for g in self.layer_group_definitions if g.name in key)
+            self._layer_groups_cache[key] = groups
+        return groups
         
-    def layers_of_groups(self, names: List[LayerGroupUniqueName]) -> List[LayerUniqueName]:
-        layer_groups = self.layer_groups(names)
-        return list(set([l for g in layer_groups for l in g.layers]))
+    def layers_of_groups(self, names: List[LayerGroupUniqueName]) -> Tuple[LayerUniqueName, ...]:
+        key = frozenset(names)
+        layers = self._layers_of_groups_cache.get(key, None)
+        if layers is None:
+            empty: FrozenSet[LayerUniqueName] = frozenset()
+            layers = tuple(empty.union(*(self._layer_sets_by_group_name.get(n, empty) for n in key)))
+            self._layers_of_groups_cache[key] = layers
+        return layers
         
-    def pin_layer_info(self, related_layer: LayerUniqueName) -> PinLayerInfo:
+    def pin_layer_names(self, pin_layer_info: PinLayerInfo) -> Tuple[LayerUniqueName, ...]:
+        names = pin_layer_info._resolved_pin_layer_names
+        if names is None:  # not one of our PinLayerInfos
+            names = self.layers_of_groups(pin_layer_info.pin_layers)
+        return names
+        
+    def label_layer_names(self, pin_layer_info: PinLayerInfo) -> Tuple[LayerUniqueName, ...]:
+        names = pin_layer_info._resolved_label_layer_names
+        if names is None:  # not one of our PinLayerInfos
+            names = self.layers_of_groups(pin_layer_info.label_layers)
+        return names
+        
+    def _build_pin_layer_info_index(self) -> Dict[LayerUniqueName, PinLayerInfo]:
+        # NOTE: first match wins (setdefault)
+        index: Dict[LayerUniqueName, PinLayerInfo] = {}
         for pli in self.pin_layer_infos:
-            if related_layer == pli.short_layer_name:
-                return pli
-            related_layers = self.layers_of_groups(pli.related_layers + pli.pin_layers + pli.label_layers)
-            if related_layer in related_layers:
-                return pli
+            index.setdefault(pli.short_layer_name, pli)
+            for l in self.layers_of_groups(pli.related_layers + pli.pin_layers + pli.label_layers):
+                index.setdefault(l, pli)
+        return index
+        
+    def pin_layer_info(self, related_layer: LayerUniqueName) -> Optional[PinLayerInfo]:
+        if self._pin_layer_infos_by_layer is None:
+            self._pin_layer_infos_by_layer = self._build_pin_layer_info_index()
+        return self._pin_layer_infos_by_layer.get(related_layer, None)
+
+
+# NOTE: tech_name is the first key of the PDK info files,
+#       so it can be found without parsing the whole file
+_TECH_NAME_PATTERN = re.compile(rb'"tech_name"\s*:\s*"([^"\\]*)"')
+_TECH_NAME_SCAN_SIZE = 256
 
 
 class PinPDKInfoFactory:
-    def __init__(self, search_path: List[Path]):
+    def __init__(self, search_path: Sequence[Path]):
+        self._search_path = search_path
+        self.invalidate()
+        
+    def invalidate(self):
+        # NOTE: only the tech_name is read while scanning,
+        #       the full PinPDKInfo is parsed on first request
+        self._paths_by_tech_name: Dict[str, List[Path]] = {}
         self._pdk_infos_by_tech_name: Dict[str, PinPDKInfo] = {}
         
-        json_files = sorted({f for p in search_path for f in p.glob('*.json')})
+        # NOTE: only a small header is read per file, a serial loop beats
+        #       the start-up cost of a thread pool for any realistic PDK count
+        json_files = sorted(set(self._scan_json_files(self._search_path)))
         for f in json_files:
+            tech_name = self._read_tech_name(f)
+            if tech_name is not None:
+                # NOTE: the header may match even if the file is broken,
+                #       so keep all candidates until one of them parses
+                self._paths_by_tech_name.setdefault(tech_name, []).append(f)
+                
+    @staticmethod
+    def _read_tech_name(path: Path) -> Optional[str]:
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(_TECH_NAME_SCAN_SIZE)
+            m = _TECH_NAME_PATTERN.search(head)
+            if m is not None:
+                return m.group(1).decode('utf-8')
+            # NOTE: not at the top of the file (or escaped), parse the whole file
+            tech_name = _load_json(path.read_bytes())['tech_name']
+            if not isinstance(tech_name, str):
+                raise TypeError(f"tech_name must be a string, got {tech_name!r}")
+            return tech_name
+        except Exception as e:
+            print(f"Failed to parse PDK info file {path}, skipping this file…", e)
+            return None
+    
+    @staticmethod
+    def _scan_json_files(search_path: Sequence[Path]) -> List[Path]:
+        json_files = []
+        for p in search_path:
             try:
-                pdk_info = PinPDKInfo.read_json(f)
-                self._pdk_infos_by_tech_name[pdk_info.tech_name] = pdk_info
-            except Exception as e:
-                print(f"Failed to parse PDK info file {f}, skipping this file…", e)
+                with os.scandir(p) as it:
+                    for e in it:
+                        if e.name.endswith('.json') and e.is_file():
+                            json_files.append(Path(e.path))
+            except FileNotFoundError:  # like Path.glob, ignore missing directories
+                continue
+        return json_files
                 
     def pdk_info(self, tech_name: str) -> Optional[PinPDKInfo]:
-        return self._pdk_infos_by_tech_name.get(tech_name, None)
+        pdk_info = self._pdk_infos_by_tech_name.get(tech_name, None)
+        if pdk_info is not None:
+            return pdk_info
+        
+        paths = self._paths_by_tech_name.get(tech_name, None)
+        if paths is None:
+            return None
+        
+        # NOTE: the last valid file wins
+        while paths:
+            path = paths.pop()
+            try:
+                pdk_info = PinPDKInfo.read_json(path)
+            except Exception as e:
+                print(f"Failed to parse PDK info file {path}, skipping this file…", e)
+                continue
+            del self._paths_by_tech_name[tech_name]
+            self._pdk_infos_by_tech_name[tech_name] = pdk_info
+            return pdk_info
+        
+        del self._paths_by_tech_name[tech_name]
+        return None
             
     @property
     def pdk_infos_by_tech_name(self) -> Dict[str, PinPDKInfo]:
+        for tech_name in list(self._paths_by_tech_name.keys()):
+            self.pdk_info(tech_name)
         return self._pdk_infos_by_tech_name
             
 #--------------------------------------------------------------------------------
 
-def dump_example_pdk_info():
-    def met_layers(name: str) -> List[str]:
-        return [f"{name}.drawing", f"{name}.pin", f"{name}.text", f"{name}.label"]
-
-    def pin_layer_info(prefix: str, key: str, i: int) -> List[PinLayerInfo]:
-        return [
-            PinLayerInfo(short_layer_name=f"{prefix}{i}", 
-                         related_layers=[f"{prefix}{i}.RelatedLayers"],
-                         pin_layers=[f"{prefix}{i}.PinLayers"],
-                         label_layers=[f"{prefix}{i}.LabelLayers"])
-        ]
-
-    pin_layer_infos: List[PinLayerInfo] = [
-        PinLayerInfo(short_layer_name="nBuLay", 
-                     related_layers=["nBuLay.RelatedLayers"],
-                     pin_layers=["nBuLay.PinLayers"],
-                     label_layers=["nBuLay.LabelLayers"]),
-        PinLayerInfo(short_layer_name="NWell", 
-                     related_layers=["NWell.RelatedLayers"],
-                     pin_layers=["NWell.PinLayers"],
-                     label_layers=["NWell.LabelLayers"]),
-        PinLayerInfo(short_layer_name="GatPoly", 
-                     related_layers=["GatPoly.RelatedLayers"],
-                     pin_layers=["GatPoly.PinLayers"],
-                     label_layers=["GatPoly.LabelLayers"])
-    ]
-    for i in range(1, 6):
-        pin_layer_infos += pin_layer_info(prefix='Metal', key=str(i), i=i)
-    for i in range(1, 3):
-        pin_layer_infos += pin_layer_info(prefix='TopMetal', key=str(5+i), i=i)
-    pin_layer_infos += [
-        PinLayerInfo(short_layer_name="IND", 
-                     related_layers=["IND.RelatedLayers"],
-                     pin_layers=["IND.PinLayers"],
-                     label_layers=["IND.LabelLayers"])
-    ]
-
-    pi = PinPDKInfo(
-        tech_name='sg13g2',
-        layer_group_definitions = [
-            NamedLayerGroup(name='nBuLay.PinLayers', layers=['nBuLay.pin']),
-            NamedLayerGroup(name='nBuLay.LabelLayers', layers=['nBuLay.label']),
-            NamedLayerGroup(name='nBuLay.RelatedLayers',  layers=['nBuLay.pin', 'nBuLay.drawing', 'nBuLay.label', 
-                                                                  'nBuLay.net', 'nBuLay.boundary', 'nBuLay.block']),
-
-            NamedLayerGroup(name='NWell.PinLayers', layers=['NWell.pin']),
-            NamedLayerGroup(name='NWell.LabelLayers', layers=['NWell.label']),
-            NamedLayerGroup(name='NWell.RelatedLayers',  layers=['NWell.pin', 'NWell.drawing', 'NWell.label', 
-                                                                 'NWell.net', 'NWell.boundary']),
-
-            NamedLayerGroup(name='GatPoly.PinLayers', layers=['GatPoly.pin']),
-            NamedLayerGroup(name='GatPoly.LabelLayers', layers=['GatPoly.label']),
-            NamedLayerGroup(name='GatPoly.RelatedLayers',  layers=['GatPoly.pin', 'GatPoly.drawing', 'GatPoly.label', 
-                                                                   'GatPoly.net', 'GatPoly.boundary', 'GatPoly.nofill']),
-            
-            NamedLayerGroup(name='Metal1.PinLayers', layers=['Metal1.pin']),
-            NamedLayerGroup(name='Metal1.LabelLayers', layers=['Metal1.text']),
-            NamedLayerGroup(name='Metal1.RelatedLayers',  layers=met_layers('Metal1') + ['Metal1.diffprb']),
+def _example_met_layers(name: str) -> List[str]:
+    return [f"{name}.drawing", f"{name}.pin", f"{name}.text", f"{name}.label"]
 
-            NamedLayerGroup(name='Metal2.PinLayers', layers=['Metal2.pin']),
-            NamedLayerGroup(name='Metal2.LabelLayers', layers=['Metal2.text']),
-            NamedLayerGroup(name='Metal2.RelatedLayers',  layers=met_layers('Metal2')),
 
-            NamedLayerGroup(name='Metal3.PinLayers', layers=['Metal3.pin']),
-            NamedLayerGroup(name='Metal3.LabelLayers', layers=['Metal3.text']),
-            NamedLayerGroup(name='Metal3.RelatedLayers',  layers=met_layers('Metal3')),
+def _example_pin_layer_info(name: str) -> PinLayerInfo:
+    return PinLayerInfo(short_layer_name=name, 
+                        related_layers=[f"{name}.RelatedLayers"],
+                        pin_layers=[f"{name}.PinLayers"],
+                        label_layers=[f"{name}.LabelLayers"])
 
-            NamedLayerGroup(name='Metal4.PinLayers', layers=['Metal4.pin']),
-            NamedLayerGroup(name='Metal4.LabelLayers', layers=['Metal4.text']),
-            NamedLayerGroup(name='Metal4.RelatedLayers',  layers=met_layers('Metal4')),
 
-            NamedLayerGroup(name='Metal5.PinLayers', layers=['Metal5.pin']),
-            NamedLayerGroup(name='Metal5.LabelLayers', layers=['Metal5.text']),
-            NamedLayerGroup(name='Metal5.RelatedLayers',  layers=met_layers('Metal5')),
+EXAMPLE_SG13G2 = PinPDKInfo(
+    tech_name='sg13g2',
+    layer_group_definitions = [
+        NamedLayerGroup(name='nBuLay.PinLayers', layers=['nBuLay.pin']),
+        NamedLayerGroup(name='nBuLay.LabelLayers', layers=['nBuLay.label']),
+        NamedLayerGroup(name='nBuLay.RelatedLayers',  layers=['nBuLay.pin', 'nBuLay.drawing', 'nBuLay.label', 
+                                                              'nBuLay.net', 'nBuLay.boundary', 'nBuLay.block']),
 
-            NamedLayerGroup(name='TopMetal1.PinLayers', layers=['TopMetal1.pin']),
-            NamedLayerGroup(name='TopMetal1.LabelLayers', layers=['TopMetal1.text']),
-            NamedLayerGroup(name='TopMetal1.RelatedLayers',  layers=met_layers('TopMetal1')),
+        NamedLayerGroup(name='NWell.PinLayers', layers=['NWell.pin']),
+        NamedLayerGroup(name='NWell.LabelLayers', layers=['NWell.label']),
+        NamedLayerGroup(name='NWell.RelatedLayers',  layers=['NWell.pin', 'NWell.drawing', 'NWell.label', 
+                                                             'NWell.net', 'NWell.boundary']),
 
-            NamedLayerGroup(name='TopMetal2.PinLayers', layers=['TopMetal2.pin']),
-            NamedLayerGroup(name='TopMetal2.LabelLayers', layers=['TopMetal2.text']),
-            NamedLayerGroup(name='TopMetal2.RelatedLayers',  layers=met_layers('TopMetal2')),
-            
-            NamedLayerGroup(name='IND.PinLayers', layers=['IND.pin']),
-            NamedLayerGroup(name='IND.LabelLayers', layers=['IND.text']),
-            NamedLayerGroup(name='IND.RelatedLayers',  layers=['IND.pin', 'IND.drawing', 'IND.text']),            
-        ],
-        pin_layer_infos=pin_layer_infos
-    )
-     
+        NamedLayerGroup(name='GatPoly.PinLayers', layers=['GatPoly.pin']),
+        NamedLayerGroup(name='GatPoly.LabelLayers', layers=['GatPoly.label']),
+        NamedLayerGroup(name='GatPoly.RelatedLayers',  layers=['GatPoly.pin', 'GatPoly.drawing', 'GatPoly.label', 
+                                                               'GatPoly.net', 'GatPoly.boundary', 'GatPoly.nofill']),
+        
+        NamedLayerGroup(name='Metal1.PinLayers', layers=['Metal1.pin']),
+        NamedLayerGroup(name='Metal1.LabelLayers', layers=['Metal1.text']),
+        NamedLayerGroup(name='Metal1.RelatedLayers',  layers=_example_met_layers('Metal1') + ['Metal1.diffprb']),
+
+        NamedLayerGroup(name='Metal2.PinLayers', layers=['Metal2.pin']),
+        NamedLayerGroup(name='Metal2.LabelLayers', layers=['Metal2.text']),
+        NamedLayerGroup(name='Metal2.RelatedLayers',  layers=_example_met_layers('Metal2')),
+
+        NamedLayerGroup(name='Metal3.PinLayers', layers=['Metal3.pin']),
+        NamedLayerGroup(name='Metal3.LabelLayers', layers=['Metal3.text']),
+        NamedLayerGroup(name='Metal3.RelatedLayers',  layers=_example_met_layers('Metal3')),
+
+        NamedLayerGroup(name='Metal4.PinLayers', layers=['Metal4.pin']),
+        NamedLayerGroup(name='Metal4.LabelLayers', layers=['Metal4.text']),
+        NamedLayerGroup(name='Metal4.RelatedLayers',  layers=_example_met_layers('Metal4')),
+
+        NamedLayerGroup(name='Metal5.PinLayers', layers=['Metal5.pin']),
+        NamedLayerGroup(name='Metal5.LabelLayers', layers=['Metal5.text']),
+        NamedLayerGroup(name='Metal5.RelatedLayers',  layers=_example_met_layers('Metal5')),
+
+        NamedLayerGroup(name='TopMetal1.PinLayers', layers=['TopMetal1.pin']),
+        NamedLayerGroup(name='TopMetal1.LabelLayers', layers=['TopMetal1.text']),
+        NamedLayerGroup(name='TopMetal1.RelatedLayers',  layers=_example_met_layers('TopMetal1')),
+
+        NamedLayerGroup(name='TopMetal2.PinLayers', layers=['TopMetal2.pin']),
+        NamedLayerGroup(name='TopMetal2.LabelLayers', layers=['TopMetal2.text']),
+        NamedLayerGroup(name='TopMetal2.RelatedLayers',  layers=_example_met_layers('TopMetal2')),
+        
+        NamedLayerGroup(name='IND.PinLayers', layers=['IND.pin']),
+        NamedLayerGroup(name='IND.LabelLayers', layers=['IND.text']),
+        NamedLayerGroup(name='IND.RelatedLayers',  layers=['IND.pin', 'IND.drawing', 'IND.text']),            
+    ],
+    pin_layer_infos=[_example_pin_layer_info(name) for name in (
+        'nBuLay', 'NWell', 'GatPoly',
+        *(f"Metal{i}" for i in range(1, 6)),
+        *(f"TopMetal{i}" for i in range(1, 3)),
+        'IND'
+    )]
+)
+
+
+def dump_example_pdk_info():
     path = os.path.abspath('ihp-sg13g2.json')
-    pi.write_json(path)
+    EXAMPLE_SG13G2.write_json(path)
     print(f"Dumped example PDK Info file to {path}")
 
 
 def test_parse():
     script_dir = Path(__file__).resolve().parent
     f = PinPDKInfoFactory(search_path=[script_dir / '..' / 'pdks'])
-    for pi in f.pdk_infos_by_tech_name.values():
-        json.dump(asdict(pi), sys.stdout, indent=4)
+    # NOTE: serialize everything up front and write it at once,
+    #       instead of many small writes into sys.stdout
+    out = b''.join(_json_dumps(pi._to_plain()) for pi in f.pdk_infos_by_tech_name.values())
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:  # e.g. the KLayout macro console
+        sys.stdout.write(out.decode('utf-8'))
+    else:
+        sys.stdout.flush()
+        buffer.write(out)
+        buffer.flush()
 
 #--------------------------------------------------------------------------------
 
@@ -17,12 +17,9 @@
 #--------------------------------------------------------------------------------
 
 from __future__ import annotations
-from dataclasses import dataclass
-import os 
+from dataclasses import dataclass, replace
 from pathlib import Path
-import sys
-import traceback
-from typing import *
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Tuple
 
 import pya
 
@@ -34,51 +31,81 @@ from klayout_plugin_utils.str_enum_compat import StrEnum
 from pin_pdk_info import *
 
 
+# NOTE: bound once at import (after Debugging.init_debugging, see autorun.lym),
+#       to spare the attribute lookup in the frequently called event handlers
+_DBG = Debugging.DEBUG
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_PDK_SEARCH_PATH = (_SCRIPT_DIR / '..' / 'pdks',)
+
 CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_LABEL = 'PinToolPlugin__pin_label'
 CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_WIDTH = 'PinToolPlugin__pin_width'
 CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_HEIGHT = 'PinToolPlugin__pin_height'
 
 
-@dataclass
+@dataclass(slots=True)
 class PinToolConfig:
     short_layer_name: Optional[str] = None
     pin_label: str = 'pin_name'
     width: float = 0.13   # µm
     height: float = 0.13  # µm
     
+    # NOTE: the parsed (native float) mirror of the stored config, KLayout's config
+    #       backend is only queried on the first load, afterwards save() keeps it in sync
+    _stored: ClassVar[Optional[PinToolConfig]] = None
+    
+    @classmethod
+    def stored(cls) -> PinToolConfig:
+        if cls._stored is None:
+            config = PinToolConfig()
+            
+            mw = pya.MainWindow.instance()
+            pin_label = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_LABEL)
+            width_str = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_WIDTH)
+            height_str = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_HEIGHT)
+    
+            if pin_label is not None:
+                config.pin_label = pin_label
+                
+            if width_str is not None:
+                config.width = float(width_str)
+                
+            if height_str is not None:
+                config.height = float(height_str)
+            
+            cls._stored = config
+        return cls._stored
+    
     @classmethod
     def load(cls) -> PinToolConfig:
-        if Debugging.DEBUG:
+        if _DBG:
             debug("PinToolConfig.load")
-            
-        config = PinToolConfig()
         
-        mw = pya.MainWindow.instance()
-        pin_label = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_LABEL)
-        width_str = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_WIDTH)
-        height_str = mw.get_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_HEIGHT)
-
-        if pin_label is not None:
-            config.pin_label = pin_label
-            
-        if width_str is not None:
-            config.width = float(width_str)
-            
-        if height_str is not None:
-            config.height = float(height_str)
-            
-        return config
+        # NOTE: callers modify the returned config, so hand out a copy
+        return replace(cls.stored())
     
     def save(self):
-        if Debugging.DEBUG:
+        if _DBG:
             debug("PinToolConfig.save")
-            
+        
+        stored = self.stored()
+        
+        # NOTE: only write what has changed, each set_config may notify observers
+        changes = []
+        if self.pin_label != stored.pin_label:
+            changes.append((CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_LABEL, self.pin_label))
+        if self.width != stored.width:
+            changes.append((CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_WIDTH, str(self.width)))
+        if self.height != stored.height:
+            changes.append((CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_HEIGHT, str(self.height)))
+        if not changes:
+            return
+        
         mw = pya.MainWindow.instance()
+        for key, value in changes:
+            mw.set_config(key, value)
         
-        mw.set_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_LABEL, self.pin_label)
-        mw.set_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_WIDTH, str(self.width))
-        mw.set_config(CONFIG_KEY__PIN_TOOL_PLUGIN__PIN_HEIGHT, str(self.height))
-
+        PinToolConfig._stored = replace(stored, pin_label=self.pin_label, width=self.width, height=self.height)
 
 class PinToolSetupDock(pya.QDockWidget):
     def __init__(self):
@@ -99,6 +126,10 @@ class PinToolSetupDock(pya.QDockWidget):
     def config_from_ui(self) -> PinToolConfig:
         return self.setupWidget.config_from_ui()
         
+    def connect_pin_size_changed(self, callback: Callable[[float], None]):
+        self.setupWidget.w_value.valueChanged.connect(callback)
+        self.setupWidget.h_value.valueChanged.connect(callback)
+        
         
 class PinToolSetupWidget(pya.QWidget):
 
@@ -130,23 +161,30 @@ class PinToolSetupWidget(pya.QWidget):
         self.layout = pya.QGridLayout()
         self.layout.setSpacing(10)
         self.layout.setVerticalSpacing(5)
-        self.layout.addWidget(self.layer_label,   0, 0)
-        self.layout.addWidget(self.layer_value,   0, 1)
-        self.layout.addWidget(self.layer_status,  0, 2)
-        self.layout.addWidget(self.pin_label,     1, 0)
-        self.layout.addWidget(self.pin_value,     1, 1)
-        self.layout.addWidget(self.w_label,       2, 0)
-        self.layout.addWidget(self.w_value,       2, 1)
-        self.layout.addWidget(self.w_unit,        2, 2)
-        self.layout.addWidget(self.h_label,       3, 0)
-        self.layout.addWidget(self.h_value,       3, 1)
-        self.layout.addWidget(self.h_unit,        3, 2)
+        grid_spec = (
+            (self.layer_label,   0, 0),
+            (self.layer_value,   0, 1),
+            (self.layer_status,  0, 2),
+            (self.pin_label,     1, 0),
+            (self.pin_value,     1, 1),
+            (self.w_label,       2, 0),
+            (self.w_value,       2, 1),
+            (self.w_unit,        2, 2),
+            (self.h_label,       3, 0),
+            (self.h_value,       3, 1),
+            (self.h_unit,        3, 2),
+        )
+        for widget, row, column in grid_spec:
+            self.layout.addWidget(widget, row, column)
         self.layout.addItem(self.spacer_item)
         self.layout.addWidget(self.cancel_info,   4, 0)
         self.layout.setRowStretch(5, 3)
         self.setLayout(self.layout)
 
         self.layer_value.currentTextChanged.connect(self.on_pin_layer_changed)
+        
+        # NOTE: deliberately not textChanged, which fires on every keystroke
+        self.pin_value.editingFinished.connect(self.on_pin_label_committed)
          
     def hideEvent(self, event):
         event.accept()
@@ -181,6 +219,10 @@ class PinToolSetupWidget(pya.QWidget):
         config = self.config_from_ui()
         self.set_config(config)
         
+    def on_pin_label_committed(self):
+        config = self.config_from_ui()
+        config.save()
+        
     def set_pdk_info(self, pdk_info: Optional[PinPDKInfo]):
         self.layer_value.clear()
         new_items = ['None selected']
@@ -190,14 +232,23 @@ class PinToolSetupWidget(pya.QWidget):
         self.layer_value.addItems(new_items)
         
     def set_config(self, config: PinToolConfig):
+        # NOTE: a programmatic change must not trigger on_pin_layer_changed,
+        #       which would just call set_config again with the same config
+        was_blocked = self.layer_value.blockSignals(True)
+        try:
+            if config.short_layer_name is None:
+                self.layer_value.setCurrentText('None selected')
+            else:
+                self.layer_value.setCurrentText(config.short_layer_name)
+        finally:
+            self.layer_value.blockSignals(was_blocked)
+        
         if config.short_layer_name is None:
-            self.layer_value.setCurrentText('None selected')
             self.layer_status.setText(
                 '<span style="color:blue; font-weight:bold;">⬅</span> '
                 '<span style="font-weight:bold; color:blue;">Next</span>'
             )
         else:
-            self.layer_value.setCurrentText(config.short_layer_name)
             self.layer_status.setText('✅')
         
         self.pin_value.setText(config.pin_label)
@@ -263,12 +314,21 @@ class PinToolPlugin(pya.Plugin):
     def __init__(self, view: pya.LayoutView):
         super().__init__()
 
-        script_dir = Path(__file__).resolve().parent
-        self.pdk_info_factory = PinPDKInfoFactory(search_path=[script_dir / '..' / 'pdks'])
+        self.pdk_info_factory = PinPDKInfoFactory(search_path=_PDK_SEARCH_PATH)
         self.pdk_info = None
         self.pin_layer_info = None
         
         self.editor_options = None
+        self._snap_cache: Optional[Tuple[Tuple[float, float], pya.DPoint]] = None
+        
+        # NOTE: lookup caches for the layer properties of the view,
+        #       invalidated whenever the layer list or the layout may have changed
+        self._layer_properties_by_name: Optional[Dict[str, pya.LayerPropertiesNodeRef]] = None
+        self._layer_index_cache: Dict[str, int] = {}
+        self._resolved_layers_cache: Dict[str, Tuple[List[int], List[int]]] = {}
+        
+        # NOTE: only changes on zoom or when switching layouts (dbu)
+        self._viewport_mag: Optional[float] = None
         
         self.setupDock      = None
         
@@ -276,35 +336,60 @@ class PinToolPlugin(pya.Plugin):
         self.view.on_layer_list_changed += self.on_layer_list_changed
         self.view.on_selection_changed += self.on_selection_changed
         self.view.on_apply_technology += self.on_apply_technology
+        self.view.on_active_cellview_changed += self.on_active_cellview_changed
+        self.view.on_viewport_changed += self.on_viewport_changed
         
         if 'on_current_layer_changed' in dir(self.view):  # KLayout >= 0.30.5
             self.view.on_current_layer_changed += self.on_current_layer_changed
             
         self.markers = []
+        self._last_preview_key: Optional[Tuple[int, int]] = None
 
     def on_layer_list_changed(self, idx: int):
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.on_layer_list_changed, "
                   f"for cell view {self.cell_view.cell_name}")
+        self.invalidate_layer_caches()
 
     def on_current_layer_changed(self, idx: int):
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.on_current_layer_changed, "
                   f"for cell view {self.cell_view.cell_name}")
     
         self.update_current_layer_status()
     
     def on_selection_changed(self):
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.on_selection_changed, "
                   f"for cell view {self.cell_view.cell_name}")
     
     def on_apply_technology(self):
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.on_apply_technology, "
                   f"for cell view {self.cell_view.cell_name}")
+        self.invalidate_layer_caches()
+        self.pdk_info_factory.invalidate()  # pick up added/edited PDK info files
         self.update_tech()
         
+    def on_active_cellview_changed(self):
+        if _DBG:
+            debug(f"PinToolPlugin.on_active_cellview_changed, "
+                  f"for cell view {self.cell_view.cell_name}")
+        self.invalidate_layer_caches()
+        self._viewport_mag = None
+        
+    def on_viewport_changed(self):
+        self._viewport_mag = None
+        self._last_preview_key = None  # marker size depends on the zoom level
+        
+    def on_pin_size_changed(self, value: float):
+        self._last_preview_key = None  # redraw the pin shape preview on the next move
+        
+    def invalidate_layer_caches(self):
+        self._layer_properties_by_name = None
+        self._layer_index_cache = {}
+        self._resolved_layers_cache = {}
+        
     @property
     def cell_view(self) -> pya.CellView:
         return self.view.active_cellview()
@@ -343,9 +428,10 @@ class PinToolPlugin(pya.Plugin):
     
     def update_tech(self):
         self.pdk_info = None
+        self._resolved_layers_cache = {}
         tech = self.tech
         if tech is None or tech.name == '':
-            if Debugging.DEBUG:
+            if _DBG:
                 debug(f"PinToolPlugin.activate, can't find technology")
         else:
             self.pdk_info = self.pdk_info_factory.pdk_info(tech.name)
@@ -379,19 +465,21 @@ class PinToolPlugin(pya.Plugin):
         if self.layout is None:
             return
 
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.activated, for cell {self.cell_view.cell.name}")
 
-        script_dir = Path(__file__).resolve().parent
-        self.pdk_info_factory = PinPDKInfoFactory(search_path=[script_dir / '..' / 'pdks'])
+        self.invalidate_layer_caches()
+        self._viewport_mag = None
     
         if not(self.setupDock):
             mw   = pya.Application.instance().main_window()
             self.setupDock = PinToolSetupDock()
+            self.setupDock.connect_pin_size_changed(self.on_pin_size_changed)
             mw.addDockWidget(pya.Qt_DockWidgetArea.RightDockWidgetArea, self.setupDock)
         self.setupDock.show()
         
         self.editor_options = EditorOptions(view=self.view)
+        self._snap_cache = None  # grid settings might have changed
 
         # NOTE: defer twice, strange but necessary
         EventLoop.defer(self.navigateToNextTextField)        
@@ -410,7 +498,7 @@ class PinToolPlugin(pya.Plugin):
         if self.pdk_info is not None:            
             current_layer_name = self.get_current_layer_name()
             if current_layer_name is None:
-                if Debugging.DEBUG:
+                if _DBG:
                     debug(f"PinToolPlugin.activate, no layer is selected")
             else:
                 self.pin_layer_info = self.pdk_info.pin_layer_info(current_layer_name)
@@ -424,7 +512,7 @@ class PinToolPlugin(pya.Plugin):
         EventLoop.defer(self.setupDock.navigateToNextTextField)
     
     def deactivated(self):
-        if Debugging.DEBUG:
+        if _DBG:
             debug("PinToolPlugin.deactivated")
         
         self.clear_markers()
@@ -436,18 +524,18 @@ class PinToolPlugin(pya.Plugin):
             self.setupDock.hide()
     
     def deactivate(self):
-        if Debugging.DEBUG:
+        if _DBG:
             debug("PinToolPlugin.deactive")
         esc_key  = 16777216 
         keyPress = pya.QKeyEvent(pya.QKeyEvent.KeyPress, esc_key, pya.Qt.NoModifier)
         pya.QApplication.sendEvent(self.view.widget(), keyPress)        
     
     def menu_activated(self, symbol: str) -> bool:
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.menu_activated: symbol={symbol}")
             
         if symbol == 'technology_selector:apply_technology':
-            if Debugging.DEBUG:
+            if _DBG:
                 debug(f"PinToolPlugin.menu_activated: "
                       f"pya.CellView.active().technology().name={pya.CellView.active().technology} (NOTE: old, that's why we need defer)")
             # NOTE: we have to defer, otherwise the CellView won't have the new tech yet
@@ -457,7 +545,7 @@ class PinToolPlugin(pya.Plugin):
     
     def technology_applied(self):
         new_tech_name = pya.CellView.active().technology
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.technology_applied, "
                   f"for cell view {self.cell_view.cell_name}, "
                   f"tech: {new_tech_name}")
@@ -466,61 +554,78 @@ class PinToolPlugin(pya.Plugin):
             self.update_tech()
         except Exception as e:
             print("PinToolPlugin.technology_applied caught an exception", e)
+            import traceback
             traceback.print_exc()        
     
     def visible_layer_indexes(self) -> List[int]:
-        idxs = []
-        for lref in self.view.each_layer():
-            if lref.visible and lref.valid:
-                if lref.layer_index() == -1:  # hidden by the user
-                    continue
-                # print(f"layer is visible, name={lref.name}, idx={lref.layer_index()}, "
-                #       f"marked={lref.marked} cellview={lref.cellview()}, "
-                #      f"source={lref.source}")
-                idxs.append(lref.layer_index())
-        return idxs
+        # NOTE: layer_index() is -1 for layers hidden by the user
+        return [li for lref in self.view.each_layer()
+                if lref.visible and lref.valid and (li := lref.layer_index()) != -1]
     
     def viewport_adjust(self, v: int) -> int:
-        trans = pya.CplxTrans(self.view.viewport_trans(), self.dbu)
-        return v / trans.mag
+        if self._viewport_mag is None:
+            self._viewport_mag = pya.CplxTrans(self.view.viewport_trans(), self.dbu).mag
+        return v / self._viewport_mag
     
     @property
     def max_distance(self) -> int:
         return self.viewport_adjust(20)
     
     def clear_markers(self):
-        for marker in self.markers:
+        markers, self.markers = self.markers, []
+        self._last_preview_key = None
+        for marker in markers:
             marker._destroy()
-        self.markers = []
 
-    def preview_markers_for_cursor(self, dpoint: pya.DPoint) -> List[pya.Marker]:
-        pt = dpoint.to_itype(self.dbu)
-        markers = []
-    
+    def create_preview_markers(self) -> List[pya.Marker]:
         point_marker = pya.Marker(self.view)
         point_marker.line_style     = 1
         point_marker.line_width     = 2
         point_marker.vertex_size    = 0
         point_marker.dither_pattern = 0
+        
+        marker = pya.Marker(self.view)
+        marker.line_style     = 2
+        marker.line_width     = 2
+        marker.vertex_size    = 0 
+        marker.dither_pattern = 1
+        
+        return [point_marker, marker]
+        
+    def update_preview_markers(self, dpoint: pya.DPoint):
+        pt = dpoint.to_itype(self.dbu)
+        
+        # NOTE: the markers are kept alive and only moved,
+        #       if the snapped point did not change, there is nothing to do
+        #       (on_pin_size_changed resets the key when the pin size is edited)
+        preview_key = (pt.x, pt.y)
+        if preview_key == self._last_preview_key:
+            return
+        self._last_preview_key = preview_key
+        
+        if not self.markers:
+            self.markers = self.create_preview_markers()
+        point_marker, marker = self.markers
+        
         d = self.viewport_adjust(5)
         marker_box = pya.Box(pya.Point(pt.x - d, pt.y - d), 
                              pya.Point(pt.x + d, pt.y + d))
         point_marker.set(marker_box.to_dtype(self.dbu))
-        markers += [point_marker]
         
         config = self.setupDock.config_from_ui()
         
         pin_shape_box = pya.DBox(pya.DPoint(dpoint.x - config.width/2.0, dpoint.y - config.height/2.0),
                                  pya.DPoint(dpoint.x + config.width/2.0, dpoint.y + config.height/2.0))        
-        marker = pya.Marker(self.view)
-        marker.line_style     = 2
-        marker.line_width     = 2
-        marker.vertex_size    = 0 
-        marker.dither_pattern = 1
         marker.set(pin_shape_box)
-        markers += [marker]        
-        
-        return markers
+    
+    def snap_to_grid(self, dpoint: pya.DPoint) -> pya.DPoint:
+        # NOTE: mouse move and click events often repeat the same position
+        key = (round(dpoint.x, 9), round(dpoint.y, 9))
+        if self._snap_cache is not None and self._snap_cache[0] == key:
+            return self._snap_cache[1]
+        snapped = self.editor_options.snap_to_grid_if_necessary(dpoint)
+        self._snap_cache = (key, snapped)
+        return snapped
     
     def mouse_moved_event(self, dpoint: pya.DPoint, buttons: int, prio: bool):
         if prio:
@@ -528,35 +633,35 @@ class PinToolPlugin(pya.Plugin):
                 return False  # not fully activated yet
                 
             # # Hotspot, don't log this       
-            # if Debugging.DEBUG:
+            # if _DBG:
             #   debug(f"PinToolPlugin.mouse_moved_event: mouse moved event, p={dpoint}, prio={prio}")
-            snapped_to_cursor = self.editor_options.snap_to_grid_if_necessary(dpoint)
-            self.markers = self.preview_markers_for_cursor(snapped_to_cursor)
+            snapped_to_cursor = self.snap_to_grid(dpoint)
+            self.update_preview_markers(snapped_to_cursor)
             return True
         return False
         
     def mouse_click_event(self, dpoint: pya.DPoint, buttons: int, prio: bool):
         if prio:
-            if buttons in [8]:  # Left click
+            if buttons == pya.ButtonState.LeftButton:  # unmodified left click
                 if self.editor_options is None:
                     return False  # not fully activated yet
                     
-                snapped_to_cursor = self.editor_options.snap_to_grid_if_necessary(dpoint)
+                snapped_to_cursor = self.snap_to_grid(dpoint)
                 self.commit_place_pin(snapped_to_cursor)
                 
-            if buttons in [16, 32]:
+            if buttons in (pya.ButtonState.MidButton, pya.ButtonState.RightButton):
                 self.clear_markers()
 
             return True
         return False
         
     def key_event(self, key: int, buttons: int):
-        if Debugging.DEBUG:
+        if _DBG:
             debug(f"PinToolPlugin.key_event: key={key}, buttons={buttons}")
 
         match key:
             case pya.KeyCode.Tab:
-                if Debugging.DEBUG:
+                if _DBG:
                     debug("PinToolPlugin.key_event: tab!")
                 if self.setupDock is not None:
                     self.clear_markers()
@@ -565,17 +670,26 @@ class PinToolPlugin(pya.Plugin):
         return False                
         
     def layer_properties_for_layer_name(self, name: str) -> Optional[pya.LayerPropertiesNodeRef]:
-        iter = self.view.begin_layers()
-        while not iter.at_end():
-            lp = iter.current()
-            if lp.name == name:
-                return lp
-            if lp.source == name:
-                return lp
-            iter.next()
-        return None
+        if self._layer_properties_by_name is None:
+            # NOTE: first match wins (setdefault), e.g. for duplicate layer names
+            layer_properties_by_name = {}
+            iter = self.view.begin_layers()
+            while not iter.at_end():
+                lp = iter.current()
+                layer_properties_by_name.setdefault(lp.name, lp)
+                layer_properties_by_name.setdefault(lp.source, lp)
+                iter.next()
+            self._layer_properties_by_name = layer_properties_by_name
+        return self._layer_properties_by_name.get(name, None)
         
     def layer_number_for_layer_name(self, name: str) -> int:
+        li = self._layer_index_cache.get(name, None)
+        if li is None:
+            li = self._resolve_layer_number(name)
+            self._layer_index_cache[name] = li
+        return li
+        
+    def _resolve_layer_number(self, name: str) -> int:
         lp = self.layer_properties_for_layer_name(name)
         if lp is None:
             return -1
@@ -586,6 +700,26 @@ class PinToolPlugin(pya.Plugin):
         li = self.layout.layer(lp.source_layer, lp.source_datatype)
         return li
         
+    def layer_indexes_of_layers(self, layer_names: Iterable[LayerUniqueName]) -> List[int]:
+        idxs = []
+        for ln in layer_names:
+            lyr = self.layer_number_for_layer_name(ln)
+            if lyr == -1:
+                raise Exception(f"PinToolPlugin.commit_place_pin, can't find layer index for layer {ln})")
+            idxs.append(lyr)
+        return idxs
+        
+    def resolved_layer_indexes(self, pin_layer_info: PinLayerInfo) -> Tuple[List[int], List[int]]:
+        # NOTE: pin placement is usually repeated with the same layer,
+        #       so resolve the pin/label layer indexes only once
+        key = pin_layer_info.short_layer_name
+        resolved = self._resolved_layers_cache.get(key, None)
+        if resolved is None:
+            resolved = (self.layer_indexes_of_layers(self.pdk_info.pin_layer_names(pin_layer_info)),
+                        self.layer_indexes_of_layers(self.pdk_info.label_layer_names(pin_layer_info)))
+            self._resolved_layers_cache[key] = resolved
+        return resolved
+        
     def commit_place_pin(self, dpoint: pya.DPoint):
         self.clear_markers()
 
@@ -601,7 +735,7 @@ class PinToolPlugin(pya.Plugin):
             self.setupDock.set_config(config)
 
         if config.short_layer_name is None:
-            if Debugging.DEBUG:
+            if _DBG:
                 debug(f"PinToolPlugin.commit_place_pin, can't find PinLayerInfo, ask user via dialog")
                 
             dialog = LayerSelectionDialog(pdk_info=self.pdk_info,
@@ -619,28 +753,33 @@ class PinToolPlugin(pya.Plugin):
         dbox = pya.DBox(dpoint.x - config.width/2.0, dpoint.y - config.height/2.0,
                         dpoint.x + config.width/2.0, dpoint.y + config.height/2.0)
         box = dbox.to_itype(self.dbu)
+        
+        try:
+            pin_layer_indexes, label_layer_indexes = self.resolved_layer_indexes(self.pin_layer_info)
+        except Exception as e:
+            print("PinToolPlugin.commit_place_pin caught an exception", e)
+            import traceback
+            traceback.print_exc()
+            return
+        
+        # NOTE: Shapes.insert copies the shapes, so one Region/Texts serves all layers
+        r = pya.Region()
+        r.insert(box)
+        dt = pya.DText(config.pin_label, dpoint.x, dpoint.y)
+        t = pya.Texts(dt.to_itype(self.dbu))
+        shapes_by_layer = [(lyr, r) for lyr in pin_layer_indexes] + \
+                          [(lyr, t) for lyr in label_layer_indexes]
+        cell = self.layout.cell(cell_index)
             
         self.view.transaction("place pin")
         try:
-            for ln in self.pdk_info.layers_of_groups(self.pin_layer_info.pin_layers):
-                r = pya.Region()
-                r.insert(box)
-                lyr = self.layer_number_for_layer_name(ln)
-                if lyr == -1:
-                    raise Exception(f"PinToolPlugin.commit_place_pin, can't find layer index for layer {ln})")
-                self.layout.insert(cell_index, lyr, r)
-                
-            for ln in self.pdk_info.layers_of_groups(self.pin_layer_info.label_layers):
-                dt = pya.DText(config.pin_label, dpoint.x, dpoint.y)
-                t = pya.Texts(dt.to_itype(self.dbu))
-                lyr = self.layer_number_for_layer_name(ln)
-                if lyr == -1:
-                    raise Exception(f"PinToolPlugin.commit_place_pin, can't find layer index for layer {ln})")
-                self.layout.insert(cell_index, lyr, t)
+            for lyr, shapes in shapes_by_layer:
+                cell.shapes(lyr).insert(shapes)
                 
-                config.save()
+            config.save()
         except Exception as e:
             print("PinToolPlugin.commit_place_pin caught an exception", e)
+            import traceback
             traceback.print_exc()
         finally:
             self.view.commit()
@@ -652,8 +791,7 @@ class PinToolPluginFactory(pya.PluginFactory):
     def __init__(self):
         super().__init__()
         
-        directory_containing_this_script = os.path.realpath(os.path.dirname(__file__))
-        icon_path = os.path.join(directory_containing_this_script, 'icons', 'pin_32px.png')
+        icon_path = str(_SCRIPT_DIR / 'icons' / 'pin_32px.png')
         
         self.register(-1000, "Pin Tool", "Pin (Shift+P)", icon_path)
   